@@ -6,6 +6,7 @@ PYTEST_DONT_REWRITE: local assertions are really that, not pytest assertions.
 import os
 import io
 import re
+import functools
 # Python >= 3.11: Self
 from typing import Any, Callable
 import importlib
@@ -17,7 +18,7 @@ import dataclasses
 log = logging.getLogger("flask_tester")
 
 
-class FlaskTesterError(BaseException):
+class FlaskTesterError(Exception):
     """Base exception for FlaskTester package."""
     pass
 
@@ -44,6 +45,12 @@ def _pytestFail(msg: str):
         pytest.fail(msg)
 
 
+@functools.lru_cache(maxsize=256)
+def _content_re(content: str|bytes) -> re.Pattern:
+    """Compile content check regular expression, with caching."""
+    return re.compile(content, re.DOTALL)
+
+
 class Authenticator:
     """Manage HTTP request authentication.
 
@@ -82,13 +89,11 @@ class Authenticator:
     Note: default values are consistent with `FlaskSimpleAuth <https://pypi.org/project/FlaskSimpleAuth/>`_.
     """
 
-    _TOKEN_SCHEMES = {"bearer", "header", "cookie", "tparam"}
-    _PASS_SCHEMES = {"basic", "param"}
+    _TOKEN_SCHEMES = frozenset({"bearer", "header", "cookie", "tparam"})
+    _PASS_SCHEMES = frozenset({"basic", "param"})
 
     # all supported authentication schemes
-    _AUTH_SCHEMES = {"fake", "none"}
-    _AUTH_SCHEMES.update(_TOKEN_SCHEMES)
-    _AUTH_SCHEMES.update(_PASS_SCHEMES)
+    _AUTH_SCHEMES = frozenset({"fake", "none"}) | _TOKEN_SCHEMES | _PASS_SCHEMES
 
     # authenticator login/pass hook
     _AuthHook = Callable[[str, str|None], None]
@@ -108,20 +113,21 @@ class Authenticator:
              ptype: str = "data",
          ):
 
-        self._has_pass, self._has_token = False, False
-        for auth in allow:
-            assert auth in self._AUTH_SCHEMES
-            if auth in self._TOKEN_SCHEMES:
-                self._has_token = True
-            if auth in self._PASS_SCHEMES:
-                self._has_pass = True
-        self._allow = allow
+        self._allow = list(allow)  # ordered, for messages
+        self._allowed = frozenset(allow)
+        assert not self._allowed - self._AUTH_SCHEMES, f"unexpected schemes: {self._allowed - self._AUTH_SCHEMES}"
+        self._has_token = bool(self._allowed & self._TOKEN_SCHEMES)
+        self._has_pass = bool(self._allowed & self._PASS_SCHEMES)
+        # allowed token carriers, by order of preference
+        self._token_carriers = tuple(s for s in ("bearer", "header", "tparam", "cookie") if s in self._allowed)
+        self._pass_carriers = tuple(s for s in ("basic", "param") if s in self._allowed)
 
         # authentication scheme parameters
         self._user = user
         self._pass = pwd
         self._login = login
         self._bearer = bearer
+        self._bearer_prefix = bearer + " "
         self._header = header
         self._cookie = cookie
         self._tparam = tparam
@@ -136,6 +142,9 @@ class Authenticator:
         self._tokens: dict[str, str] = {}
         self._cookies: dict[str, dict[str, str]] = {}
 
+        # (login, auth) -> selected scheme
+        self._scheme_cache: dict[tuple[str, str|None], str] = {}
+
     def _set(self, key: str, val: str|None, store: dict[str, str]):
         """Set a key/value in a directory, with None for delete."""
         if val is None:
@@ -145,7 +154,8 @@ class Authenticator:
             assert isinstance(val, str)
             store[key] = val
 
-    def setHook(self, hook: _AuthHook):
+    def setHook(self, hook: _AuthHook|None):
+        """Set hook called on ``setPass``, *None* to remove."""
         self._auth_hook = hook
 
     def setPass(self, login: str, pw: str|None):
@@ -156,12 +166,15 @@ class Authenticator:
         if not self._has_pass:
             raise AuthError("cannot set password, no password scheme allowed")
         self._set(login, pw, self._passes)
+        self._scheme_cache.clear()
         _ = self._auth_hook and self._auth_hook(login, pw)
 
     def setPasses(self, pws: list[str]):
         """Associate a list of *login:password*."""
         for lp in pws:
-            login, pw = lp.split(":", 1)
+            login, sep, pw = lp.partition(":")
+            if not sep:
+                raise AuthError(f"bad login:password entry: {lp}")
             self.setPass(login, pw)
 
     def setToken(self, login: str, token: str|None):
@@ -172,6 +185,7 @@ class Authenticator:
         if not self._has_token:
             raise AuthError("cannot set token, no token scheme allowed")
         self._set(login, token, self._tokens)
+        self._scheme_cache.clear()
 
     def setCookie(self, login: str, name: str, val: str|None = None):
         """Associate a cookie and its value to a login, *None* to remove."""
@@ -179,89 +193,116 @@ class Authenticator:
             self._cookies[login] = {}
         self._set(name, val, self._cookies[login])
 
-    def _param(self, kwargs: dict[str, Any], key: str, val: Any):
-        """Add request parameter to ``json`` or ``data``."""
-
-        if "json" in kwargs:
-            assert isinstance(kwargs["json"], dict)
-            kwargs["json"][key] = val
-        elif "data" in kwargs:
-            assert isinstance(kwargs["data"], dict)
-            kwargs["data"][key] = val
-        else:
-            kwargs[self._ptype] = {key: val}
-
-    def _try_auth(self, auth: str|None, scheme: str) -> bool:
-        """Whether to try this authentication scheme."""
-        return auth in (None, scheme) and scheme in self._allow
-
-    def setAuth(self, login: str|None, kwargs: dict[str, Any], cookies: dict[str, str], auth: str|None = None):
-        """Set request authentication.
-
-        :param login: Login target, *None* means no authentication.
-        :param kwargs: Request parameters to modify.
-        :param cookies: Request cookies to modify.
-        :param auth: Authentication method, default is *None*.
-
-        The default behavior is to try allowed schemes: token first,
-        then password, then fake.
-        """
-
-        log.debug(f"setAuth: login={login} auth={auth} allow={self._allow}")
-
-        if login is None:  # not needed
-            return
-
-        cookies.update(self._cookies.get(login, {}))
+    def snapshot(self) -> Any:
+        """Return a copy of credentials, cookies and hook, see `restore`."""
+        cookies = {login: dict(values) for login, values in self._cookies.items()}
+        return dict(self._passes), dict(self._tokens), cookies, self._auth_hook
+
+    def restore(self, state: Any):
+        """Restore credentials, cookies and hook from a `snapshot`."""
+        passes, tokens, cookies, self._auth_hook = state
+        self._passes = dict(passes)
+        self._tokens = dict(tokens)
+        self._cookies = {login: dict(values) for login, values in cookies.items()}
+        self._scheme_cache.clear()
+
+    def _params(self, kwargs: dict[str, Any]) -> dict[str, Any]:
+        """Get request parameters from ``json`` or ``data``, or create default type."""
+
+        params = kwargs.get("json")
+        if params is None:
+            params = kwargs.get("data")
+        if params is None:
+            params = kwargs[self._ptype] = {}
+        assert isinstance(params, dict)
+        return params
+
+    def _get_scheme(self, login: str, auth: str|None) -> str:
+        """Select the authentication scheme for a login, see `setAuth`."""
 
         if auth is not None:
             if auth not in self._AUTH_SCHEMES:
                 raise AuthError(f"unexpected auth: {auth}")
-            if auth not in self._allow:
+            if auth not in self._allowed:
                 raise AuthError(f"auth is not allowed: {auth}")
 
-        headers = kwargs.get("headers", {})
-
         # use token if available and allowed
         if login in self._tokens and auth in (None, "bearer", "header", "cookie", "tparam"):
 
-            token = self._tokens[login]
-
-            if self._try_auth(auth, "bearer"):
-                headers["Authorization"] = self._bearer + " " + token
-            elif self._try_auth(auth, "header"):
-                headers[self._header] = token
-            elif self._try_auth(auth, "tparam"):
-                self._param(kwargs, self._tparam, token)
-            elif self._try_auth(auth, "cookie"):
-                cookies[self._cookie] = token
-            else:
+            # explicit auth is known to be allowed, else use the preferred carrier
+            carriers: tuple[str, ...] = self._token_carriers if auth is None else (auth,)
+
+            if not carriers:
                 raise AuthError(f"no token carrier: login={login} auth={auth} allow={self._allow}")
 
+            return carriers[0]
+
         elif login in self._passes and auth in (None, "basic", "param"):
 
-            if self._try_auth(auth, "basic"):
-                kwargs["auth"] = (login, self._passes[login])
-            elif self._try_auth(auth, "param"):
-                self._param(kwargs, self._user, login)
-                self._param(kwargs, self._pass, self._passes[login])
-            else:
+            carriers = self._pass_carriers if auth is None else (auth,)
+
+            if not carriers:
                 raise AuthError(f"no password carrier: login={login} auth={auth} allow={self._allow}")
 
-        elif self._try_auth(auth, "fake"):
+            return carriers[0]
 
-            self._param(kwargs, self._login, login)
+        elif auth in (None, "fake") and "fake" in self._allowed:
 
-        elif self._try_auth(auth, "none"):
+            return "fake"
 
-            pass
+        elif auth in (None, "none") and "none" in self._allowed:
+
+            return "none"
 
         else:
 
             raise AuthError(f"no authentication for login={login} auth={auth} allow={self._allow}")
 
-        if headers:  # put headers back if needed
-            kwargs["headers"] = headers
+    def setAuth(self, login: str|None, kwargs: dict[str, Any], cookies: dict[str, str], auth: str|None = None):
+        """Set request authentication.
+
+        :param login: Login target, *None* means no authentication.
+        :param kwargs: Request parameters to modify.
+        :param cookies: Request cookies to modify.
+        :param auth: Authentication method, default is *None*.
+
+        The default behavior is to try allowed schemes: token first,
+        then password, then fake.
+        """
+
+        log.debug("setAuth: login=%s auth=%s allow=%s", login, auth, self._allow)
+
+        if login is None:  # not needed
+            return
+
+        # scheme selection only depends on credentials, which reset the cache
+        # bad or disallowed schemes are rejected here, before any change
+        scheme = self._scheme_cache.get((login, auth))
+        if scheme is None:
+            scheme = self._scheme_cache[(login, auth)] = self._get_scheme(login, auth)
+
+        login_cookies = self._cookies.get(login)
+        if login_cookies:
+            cookies.update(login_cookies)
+
+        if scheme == "bearer":
+            kwargs.setdefault("headers", {})["Authorization"] = self._bearer_prefix + self._tokens[login]
+        elif scheme == "header":
+            kwargs.setdefault("headers", {})[self._header] = self._tokens[login]
+        elif scheme == "tparam":
+            self._params(kwargs)[self._tparam] = self._tokens[login]
+        elif scheme == "cookie":
+            cookies[self._cookie] = self._tokens[login]
+        elif scheme == "basic":
+            kwargs["auth"] = (login, self._passes[login])
+        elif scheme == "param":
+            params = self._params(kwargs)
+            params[self._user] = login
+            params[self._pass] = self._passes[login]
+        elif scheme == "fake":
+            self._params(kwargs)[self._login] = login
+        else:  # none
+            pass
 
 
 class RequestFlaskResponse:
@@ -273,31 +314,108 @@ class RequestFlaskResponse:
 
     - ``status_code``: integer status code.
     - ``data``: body as bytes.
-    - ``text``: body as a string.
+    - ``text``: body as a string, decoded on first access.
     - ``headers``: dict of headers and their values.
     - ``cookies``: dict of cookies.
-    - ``json``: JSON-converted body, or *None*.
-    - ``is_json``: whether body was in JSON.
+    - ``json``: JSON-converted body, or *None*, decoded on first access.
+    - ``is_json``: whether body was in JSON, as declared by its content type.
 
     Constructor parameter:
 
     :param response: Response from request.
     """
 
+    # one instance per request
+    __slots__ = ("_response", "status_code", "_text", "_json", "_is_json")
+
     def __init__(self, response):
 
         self._response = response
         self.status_code = response.status_code
-        self.data = response.content
-        self.text = response.text
-        self.headers = response.headers
-        self.cookies = response.cookies
-        try:
-            self.json = response.json()
-            self.is_json = True
-        except Exception:
-            self.json = None
-            self.is_json = False
+        # lazy text and JSON decoding
+        self._text: str|None = None
+        self._json: Any = None
+        self._is_json: bool|None = None
+
+    @property
+    def data(self) -> bytes:
+        """Body as bytes."""
+        return self._response.content
+
+    @property
+    def text(self) -> str:
+        """Body as a string, decoded on first access."""
+        text = self._text
+        if text is None:
+            text = self._text = self._response.text
+        return text
+
+    @property
+    def headers(self):
+        """Dict of headers and their values."""
+        return self._response.headers
+
+    @property
+    def cookies(self):
+        """Dict of cookies."""
+        return self._response.cookies
+
+    def _decode_json(self):
+        """Decode JSON body, if possible and declared as such, like Flask."""
+        self._json, self._is_json = None, False
+        # media types are case-insensitive
+        mimetype = self._response.headers.get("Content-Type", "").partition(";")[0].strip().lower()
+        if mimetype == "application/json" or \
+           mimetype.startswith("application/") and mimetype.endswith("+json"):
+            try:
+                self._json = self._response.json()
+                self._is_json = True
+            except Exception:
+                pass
+
+    @property
+    def json(self) -> Any:
+        """JSON-converted body, or *None*."""
+        if self._is_json is None:
+            self._decode_json()
+        return self._json
+
+    @property
+    def is_json(self) -> bool:
+        """Whether body was in JSON."""
+        if self._is_json is None:
+            self._decode_json()
+        return bool(self._is_json)
+
+
+# json parameter values passed as is
+_JSON_TYPES = (bool, int, float, str, tuple, list, dict)
+
+
+def _data_value(val: Any) -> Any:
+    """Convert a data parameter value not found in ``_DATA_CONVERT``."""
+    if isinstance(val, (io.IOBase, tuple, bool, int, float, str)):
+        return val  # file parameters? or simple types
+    elif isinstance(val, (list, dict)):
+        return json.dumps(val)
+    elif callable(getattr(val, "model_dump_json", None)):
+        return val.model_dump_json()
+    else:
+        return json.dumps(dataclasses.asdict(val))
+
+
+# data parameter conversion per exact type, *None* when passed as is
+# FIXME bool seems KO
+_DATA_CONVERT: dict[type, Callable[[Any], Any]|None] = {
+    type(None): lambda _: "null",
+    bool: None,
+    int: None,
+    float: None,
+    str: None,
+    tuple: None,  # file parameters?
+    list: json.dumps,
+    dict: json.dumps,
+}
 
 
 class Client:
@@ -307,19 +425,22 @@ class Client:
 
     :param auth: Authenticator.
     :param default_login: When ``login`` is not set.
+    :param search_max: Only search ``content`` in this response body prefix,
+        defaults to *None* for the whole body.
     """
 
     # client login/pass hook (with mypy workaround)
     # Python >= 3.11: Self
     AuthHook = Callable[[Any, str, str|None], None]  # type: ignore
 
-    def __init__(self, auth: Authenticator, default_login: str|None = None):
+    def __init__(self, auth: Authenticator, default_login: str|None = None, search_max: int|None = None):
         self._auth = auth
-        self._cookies: dict[str, dict[str, str]] = {}  # login -> name -> value
         self._default_login = default_login
+        self._search_max = search_max
 
-    def setHook(self, hook: AuthHook):
-        self._auth.setHook(lambda u, p: hook(self, u, p))
+    def setHook(self, hook: AuthHook|None):
+        """Set hook called on ``setPass``, *None* to remove."""
+        self._auth.setHook(None if hook is None else lambda u, p: hook(self, u, p))
 
     def setToken(self, login: str, token: str|None):
         """Associate a token to a login, *None* to remove."""
@@ -333,11 +454,33 @@ class Client:
         """Associate a cookie to a login, *None* name to remove."""
         self._auth.setCookie(login, name, val)
 
+    def snapshot(self) -> Any:
+        """Return a copy of authenticator state and default login, see `restore`."""
+        return self._auth.snapshot(), self._default_login
+
+    def restore(self, state: Any):
+        """Restore authenticator state and default login from a `snapshot`.
+
+        Cookies kept by the underlying transport, eg set by the application,
+        are also cleared, so that they do not leak to later tests.
+        """
+        auth_state, self._default_login = state
+        self._auth.restore(auth_state)
+        self._clear_cookies()
+
+    def _clear_cookies(self):
+        """Clear transport cookies, if any."""
+        pass
+
+    def close(self):
+        """Release client resources, if any."""
+        pass
+
     def _request(self, method: str, path: str, cookies: dict[str, str], **kwargs):
         """Run a request and return response."""
         raise NotImplementedError()
 
-    def request(self, method: str, path: str, status: int|None = None, content: str|None = None,
+    def request(self, method: str, path: str, status: int|None = None, content: str|bytes|re.Pattern|None = None,
                 auth: str|None = None, **kwargs):
         """Run a possibly authenticated HTTP request.
 
@@ -349,22 +492,19 @@ class Client:
         Optional parameters:
 
         :param status: Expected HTTP status, *None* to skip status check.
-        :param content: Regular expression for response body, *None* to skip content check.
+        :param content: Regular expression for response body, possibly precompiled,
+            *None* to skip content check. A *bytes* expression searches the raw
+            body, without decoding it.
         :param login: Authenticated user, use **explicit** *None* to skip default.
         :param auth: Authentication scheme to use instead of default behavior.
         :param **kwargs: More request parameters (headers, data, json…).
         """
 
-        if "login" in kwargs:
-            login = kwargs["login"]
-            del kwargs["login"]
-        else:  # if unset, use default
-            login = self._default_login
+        # if unset, use default, but an explicit None means no authentication
+        login = kwargs.pop("login", self._default_login)
 
-        cookies: dict[str, str] = {}
-        if "cookies" in kwargs:
-            cookies.update(kwargs["cookies"])
-            del kwargs["cookies"]
+        # local copy, as authentication may add cookies
+        cookies: dict[str, str] = dict(kwargs.pop("cookies", ()))
 
         # this is forbidden by Flask client
         if "json" in kwargs and "data" in kwargs:
@@ -376,13 +516,13 @@ class Client:
         if "json" in kwargs:
             json_param = kwargs["json"]
             assert isinstance(json_param, dict)
-            for name in list(json_param.keys()):
-                val = json_param[name]
+            # only values are replaced, so iterating is safe
+            for name, val in json_param.items():
                 if val is None:
                     pass
-                elif isinstance(val, (bool, int, float, str, tuple, list, dict)):
+                elif isinstance(val, _JSON_TYPES):
                     pass
-                elif "model_dump" in val.__dir__() and callable(val.model_dump):
+                elif callable(getattr(val, "model_dump", None)):
                     # probably pydantic
                     json_param[name] = val.model_dump()
                 else: # pydantic or standard dataclasses?
@@ -392,24 +532,14 @@ class Client:
         if "data" in kwargs:
             data_param = kwargs["data"]
             assert isinstance(data_param, dict)
-            for name in list(data_param.keys()):
-                val = data_param[name]
-                if val is None:
-                    data_param[name] = "null"
-                elif isinstance(val, (io.IOBase, tuple)):
-                    pass  # file parameters?
-                elif isinstance(val, (bool, int, float, str)):
-                    # FIXME bool seems KO
-                    pass
-                elif isinstance(val, (list, dict)):
-                    data_param[name] = json.dumps(val)
-                elif "model_dump_json" in val.__dir__() and callable(val.model_dump_json):
-                    data_param[name] = val.model_dump_json()
-                else:
-                    data_param[name] = json.dumps(dataclasses.asdict(val))
+            for name, val in data_param.items():
+                convert = _DATA_CONVERT.get(type(val), _data_value)
+                if convert is not None:
+                    data_param[name] = convert(val)
 
         # now set authentication headers and do the query
-        self._auth.setAuth(login, kwargs, cookies, auth=auth)
+        if login is not None:
+            self._auth.setAuth(login, kwargs, cookies, auth=auth)
         res = self._request(method, path, cookies, **kwargs)  # type: ignore
 
         # check status
@@ -420,29 +550,35 @@ class Client:
 
         # check content
         if content is not None:
-            if not re.search(content, res.text, re.DOTALL):
+            pattern = content if isinstance(content, re.Pattern) else _content_re(content)
+            body = res.data if isinstance(pattern.pattern, bytes) else res.text
+            if self._search_max is None:
+                found = pattern.search(body)
+            else:  # bounded search, without slicing
+                found = pattern.search(body, 0, self._search_max)
+            if not found:
                 # FIXME what if the useful part is at the end?
-                _pytestFail(f"cannot find {content} in {res.text[:512]}...")
+                _pytestFail(f"cannot find {pattern.pattern!r} in {res.text[:512]}...")
 
         return res
 
-    def get(self, path: str, status: int|None = None, content: str|None = None, **kwargs):
+    def get(self, path: str, status: int|None = None, content: str|bytes|re.Pattern|None = None, **kwargs):
         """HTTP GET request, see `Client.request`."""
         return self.request("GET", path, status=status, content=content, **kwargs)
 
-    def post(self, path: str, status: int|None = None, content: str|None = None, **kwargs):
+    def post(self, path: str, status: int|None = None, content: str|bytes|re.Pattern|None = None, **kwargs):
         """HTTP POST request, see `Client.request`."""
         return self.request("POST", path, status=status, content=content, **kwargs)
 
-    def put(self, path: str, status: int|None = None, content: str|None = None, **kwargs):
+    def put(self, path: str, status: int|None = None, content: str|bytes|re.Pattern|None = None, **kwargs):
         """HTTP PUT request, see `Client.request`."""
         return self.request("PUT", path, status=status, content=content, **kwargs)
 
-    def patch(self, path: str, status: int|None = None, content: str|None = None, **kwargs):
+    def patch(self, path: str, status: int|None = None, content: str|bytes|re.Pattern|None = None, **kwargs):
         """HTTP PATCH request, see `Client.request`."""
         return self.request("PATCH", path, status=status, content=content, **kwargs)
 
-    def delete(self, path: str, status: int|None = None, content: str|None = None, **kwargs):
+    def delete(self, path: str, status: int|None = None, content: str|bytes|re.Pattern|None = None, **kwargs):
         """HTTP DELETE request, see `Client.request`."""
         return self.request("DELETE", path, status=status, content=content, **kwargs)
 
@@ -455,23 +591,26 @@ class RequestClient(Client):
     :param auth: Authenticator.
     :param base_url: Target server.
     :param default_login: When ``login`` is not set.
+    :param search_max: Bound ``content`` search, see `Client`.
     """
 
-    def __init__(self, auth: Authenticator, base_url: str, default_login=None):
-        super().__init__(auth, default_login)
+    def __init__(self, auth: Authenticator, base_url: str, default_login=None, search_max=None):
+        super().__init__(auth, default_login, search_max)
         self._base_url = base_url
         # reuse connections, otherwise it is too slow…
         from requests import Session
         self._requests = Session()
+        self._do_request = self._requests.request
 
     def _request(self, method: str, path: str, cookies: dict[str, str], **kwargs):
         """Actual request handling."""
 
-        if "data" in kwargs:
-            # "data" to "files" parameter transfer
-            data = kwargs["data"]
+        # skip the scan for the common no-upload case
+        if "data" in kwargs and any(isinstance(v, (io.IOBase, tuple)) for v in kwargs["data"].values()):
+            # "data" to "files" parameter transfer, in one pass
+            data: dict[str, Any] = {}
             files: dict[str, Any] = {}
-            for name, whatever in data.items():
+            for name, whatever in kwargs["data"].items():
                 # FIXME what types should be accepted?
                 if isinstance(whatever, io.IOBase):
                     files[name] = whatever
@@ -480,18 +619,25 @@ class RequestClient(Client):
                     file_handle, file_name, file_type = whatever
                     files[name] = (file_name, file_handle, file_type)
                 else:
-                    pass
-            for name in files:
-                del data[name]
+                    data[name] = whatever
             assert "files" not in kwargs
+            kwargs["data"] = data
             kwargs["files"] = files
             # sanity
             assert not (files and "json" in kwargs), "cannot mix file upload and json?"
 
-        res = self._requests.request(method, self._base_url + path, cookies=cookies, **kwargs)
+        res = self._do_request(method, self._base_url + path, cookies=cookies, **kwargs)
 
         return RequestFlaskResponse(res)
 
+    def _clear_cookies(self):
+        """Clear the session cookie jar."""
+        self._requests.cookies.clear()
+
+    def close(self):
+        """Close the underlying session."""
+        self._requests.close()
+
 
 class FlaskClient(Client):
     """Flask-based test provider.
@@ -501,41 +647,53 @@ class FlaskClient(Client):
     :param auth: Authenticator.
     :param client: Flask actual ``test_client``.
     :param default_login: When ``login`` is not set.
+    :param search_max: Bound ``content`` search, see `Client`.
 
     Note: this client handles `cookies`.
     """
 
-    def __init__(self, auth: Authenticator, client, default_login=None):
-        super().__init__(auth, default_login)
+    def __init__(self, auth: Authenticator, client, default_login=None, search_max=None):
+        super().__init__(auth, default_login, search_max)
         self._client = client
-        self._cookie_names: set[str] = set()  # FIXME all encountered cookies for cleanup :-/
+        self._cookie_names: set[str] = set()  # cookies set on the previous request
 
     def _request(self, method: str, path: str, cookies: dict[str, str], **kwargs):
         """Actual request handling."""
 
-        # hack to cleanup client state :-/
-        for cookie in self._cookie_names:
+        # hack to cleanup client state, only previous cookies need removal :-/
+        for cookie in self._cookie_names.difference(cookies):
             self._client.delete_cookie(cookie)
 
         for cookie, val in cookies.items():
-            if cookie not in self._cookie_names:
-                self._cookie_names.add(cookie)
             self._client.set_cookie(cookie, val)
 
+        self._cookie_names = set(cookies)
+
         return self._client.open(method=method, path=path, **kwargs)
 
+    def _clear_cookies(self):
+        """Clear the test client cookies, without a public way to list them."""
+        if getattr(self._client, "_cookies", None):
+            self._client._cookies.clear()
+        self._cookie_names = set()
+
+# FLASK_TESTER_LOG_LEVEL values
+_LOG_LEVELS = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL,
+    "NOTSET": logging.NOTSET,
+}
+
 def _ft_authenticator():
     """Fixture implementation, separated for testing purposes."""
 
     level = os.environ.get("FLASK_TESTER_LOG_LEVEL", "NOTSET")
-    log.setLevel(logging.DEBUG if level == "DEBUG" else
-                 logging.INFO if level == "INFO" else
-                 logging.WARNING if level == "WARNING" else
-                 logging.ERROR if level == "ERROR" else
-                 logging.CRITICAL if level == "CRITICAL" else
-                 logging.NOTSET)
+    log.setLevel(_LOG_LEVELS.get(level, logging.NOTSET))
 
-    allow = os.environ.get("FLASK_TESTER_ALLOW", "bearer basic param none").split(" ")
+    allow = os.environ.get("FLASK_TESTER_ALLOW", "bearer basic param none").split()
 
     # per-scheme parameters, must be consistent with FSA configuration
     user = os.environ.get("FLASK_TESTER_USER", "USER")
@@ -557,9 +715,17 @@ def _ft_authenticator():
 
     return auth
 
-@pytest.fixture
+def _ft_scope(fixture_name: str, config) -> Any:  # pytest scope literal
+    """Fixture scope from ``FLASK_TESTER_SCOPE``, defaults to ``session``."""
+    return os.environ.get("FLASK_TESTER_SCOPE", "session")
+
+
+@pytest.fixture(scope=_ft_scope)
 def ft_authenticator():
-    """Pytest Fixture: ft_authenticator.
+    """Pytest Fixture: ft_authenticator, session-scoped by default.
+
+    The scope can be changed with ``FLASK_TESTER_SCOPE``, eg ``function`` for
+    a fresh authenticator per test.
 
     Environment variables:
 
@@ -591,43 +757,59 @@ def ft_authenticator():
 
     yield _ft_authenticator()
 
+def _ft_load_app(test_app: str):
+    """Find Flask application from ``FLASK_TESTER_APP``."""
+
+    # load app package
+    pkg_name, sep, app_name = test_app.partition(":")
+    if sep:  # override defaults
+        app_names = [app_name]
+    else:
+        app_names = ["app", "application", "create_app", "make_app"]
+    pkg = importlib.import_module(pkg_name)
+    # find app in package
+    app = None
+    for name in app_names:
+        app = getattr(pkg, name, None)
+        if app is not None:
+            if callable(app) and not hasattr(app, "test_client"):
+                app = app()
+            break
+    # none found
+    if not app:
+        raise FlaskTesterError(f"cannot find Flask app in {pkg_name} ({test_app})")
+
+    return app
+
+# session-scoped fixtures load or create the application once
+_ft_app = functools.lru_cache(maxsize=None)(_ft_load_app)
+
 def _ft_client(authenticator):
     """Fixture implementation separated for testing."""
 
     default_login = os.environ.get("FLASK_TESTER_DEFAULT", None)
+    search_max = int(os.environ["FLASK_TESTER_SEARCH_MAX"]) if "FLASK_TESTER_SEARCH_MAX" in os.environ else None
     client: Client
 
     test_app = os.environ.get("FLASK_TESTER_APP", "app")
 
-    if test_app.startswith("http://") or test_app.startswith("https://"):
-        client = RequestClient(authenticator, test_app, default_login)
+    if test_app.startswith(("http://", "https://")):
+        client = RequestClient(authenticator, test_app, default_login, search_max)
     else:
-        # load app package
-        if ":" in test_app:  # override defaults
-            pkg_name, app_name = test_app.split(":", 1)
-            app_names = [app_name]
-        else:
-            pkg_name = test_app
-            app_names = ["app", "application", "create_app", "make_app"]
-        pkg = importlib.import_module(pkg_name)
-        # find app in package
-        app = None
-        for name in app_names:
-            if hasattr(pkg, name):
-                app = getattr(pkg, name)
-                if callable(app) and not hasattr(app, "test_client"):
-                    app = app()
-                break
-        # none found
-        if not app:
-            raise FlaskTesterError(f"cannot find Flask app in {pkg_name} ({test_app})")
-        client = FlaskClient(authenticator, app.test_client(), default_login)  # type: ignore
+        # the application is created once per session, or per client with other scopes
+        load_app = _ft_app if _ft_scope("ft_client", None) == "session" else _ft_load_app
+        app = load_app(test_app)
+        client = FlaskClient(authenticator, app.test_client(), default_login, search_max)  # type: ignore
 
     return client
 
-@pytest.fixture
+@pytest.fixture(scope=_ft_scope)
 def ft_client(ft_authenticator):
-    """Pytest Fixture: ft_client.
+    """Pytest Fixture: ft_client, session-scoped by default, see ``FLASK_TESTER_SCOPE``.
+
+    As the client is shared by all tests, changes to its credentials, cookies
+    or hook should be undone by the test or local fixture which made them,
+    possibly with ``snapshot`` and ``restore``.
 
     Mandatory target environment variable:
 
@@ -635,10 +817,14 @@ def ft_client(ft_authenticator):
       ``app:create_app`` for an internal test, or
       ``http://localhost:5000`` for an external test.
 
-    Other environment variable:
+    Other environment variables:
 
     - ``FLASK_TESTER_DEFAULT``: Default client login, default is *None* for no
       default.
+    - ``FLASK_TESTER_SEARCH_MAX``: Only search ``content`` within this number
+      of characters of response bodies, default is *None* for no limit.
     """
 
-    yield _ft_client(ft_authenticator)
+    client = _ft_client(ft_authenticator)
+    yield client
+    client.close()
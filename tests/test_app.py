@@ -8,17 +8,18 @@ import http.server as htsv
 import threading
 import io
 import logging
+import collections
+import copy
+import re
 import model
 
-logging.basicConfig(level=logging.INFO)
-# logging.basicConfig(level=logging.DEBUG)
 log = logging.getLogger("test")
 
 # set authn for ft_authenticator
 os.environ.update(
     FLASK_TESTER_TESTING="*",
     FLASK_TESTER_ALLOW="bearer basic param none",
-    FLASK_TESTER_AUTH=",".join(f"{l}:{p}" for l, p in secret.PASSES.items()),
+    FLASK_TESTER_AUTH=secret.AUTH_ENV,
 )
 
 def test_sanity():
@@ -33,10 +34,27 @@ def authHook(api, user: str, pwd: str|None):
             res = api.get("/login", login=user, auth="basic", status=200)
             api.setToken(user, res.json["token"])
         except ft.FlaskTesterError as e:  # pragma: no cover
-            log.warning(f"error: {e}")
+            log.warning("error: %s", e)
     else:  # cleanup
         api.setToken(user, None)
 
+@pytest.fixture(scope=ft._ft_scope)
+def ft_state(ft_client):
+    # initial credentials, cookies and default, from the environment
+    return ft_client.snapshot()
+
+@pytest.fixture(autouse=True)
+def ft_reset(request):
+    # tests without the client do not need the app
+    if "ft_client" not in request.fixturenames:
+        yield
+        return
+    ft_client = request.getfixturevalue("ft_client")
+    ft_state = request.getfixturevalue("ft_state")
+    yield
+    # restore initial state, as ft_client is shared
+    ft_client.restore(ft_state)
+
 @pytest.fixture
 def app(ft_client):
     # hook when adding login/passwords
@@ -49,9 +67,6 @@ def app(ft_client):
     ft_client.setCookie("calvin", "lang", "en")
     # return working client
     yield ft_client
-    # cleanup
-    ft_client.setPass("calvin", None)
-    ft_client.setPass("hobbes", None)
 
 def test_app_admin(app):  # GET /admin
     app.get("/admin", login=None, status=401)
@@ -69,90 +84,108 @@ def test_app_who_am_i(app):  # GET /who-am-i
         res = app.get("/who-am-i", login="hobbes", auth=auth, status=200)
         assert res.json["lang"] == "fr" and not res.json["isadmin"]
 
+@pytest.fixture(scope=ft._ft_scope)
+def api_tokens(ft_client):
+    # get valid tokens using password authn on /login, once as it is slow
+    tokens = {}
+    body = ft_client.get("/login", login="calvin", auth="basic", status=200).json
+    assert body["user"] == "calvin"
+    tokens["calvin"] = body["token"]
+    body = ft_client.post("/login", login="hobbes", auth="param", status=201, data={}).json
+    assert body["user"] == "hobbes"
+    tokens["hobbes"] = body["token"]
+    body = ft_client.post("/login", login="susie", auth="param", status=201, json={}).json
+    assert body["user"] == "susie"
+    tokens["susie"] = body["token"]
+    ft_client.get("/login", login="calvin", auth="none", status=401)
+    return tokens
+
 @pytest.fixture
-def api(ft_client):
+def api(ft_client, api_tokens):
     # set a default
     ft_client._default_login = "calvin"
     # bad password and token
-    ft_client.setPass("moe", None)
-    ft_client.setToken("moe", None)
     ft_client.setPass("moe", "bad password")
     ft_client.setToken("moe", "bad token")
     # set language cookies
     ft_client.setCookie("calvin", "lang", "en")
     ft_client.setCookie("hobbes", "lang", "fr")
-    # get valid tokens using password authn on /login
-    res = ft_client.get("/login", login="calvin", auth="basic", status=200)
-    assert res.json["user"] == "calvin"
-    ft_client._auth.setToken("calvin", res.json["token"])
-    res = ft_client.post("/login", login="hobbes", auth="param", status=201, data={})
-    assert res.json["user"] == "hobbes"
-    ft_client._auth.setToken("hobbes", res.json["token"])
-    res = ft_client.post("/login", login="susie", auth="param", status=201, json={})
-    assert res.json["user"] == "susie"
-    ft_client._auth.setToken("susie", res.json["token"])
-    ft_client.get("/login", login="calvin", auth="none", status=401)
+    # valid tokens, reset after each test
+    for login, token in api_tokens.items():
+        ft_client._auth.setToken(login, token)
+    # ready for testing routes
+    yield ft_client
+
+def test_api_tokens(api):
     # check that token auth and cookie is ok
-    res = ft_client.get("/who-am-i", login="calvin", status=200, auth="bearer")
+    res = api.get("/who-am-i", login="calvin", status=200, auth="bearer")
     assert res.json["user"] == "calvin" and res.json["lang"] == "en"
-    res = ft_client.get("/who-am-i", login="hobbes", status=200, auth="bearer")
+    res = api.get("/who-am-i", login="hobbes", status=200, auth="bearer")
     assert res.json["user"] == "hobbes" and res.json["lang"] == "fr"
-    res = ft_client.get("/who-am-i", login="susie", status=200, auth="bearer")
+    res = api.get("/who-am-i", login="susie", status=200, auth="bearer")
     assert res.json["user"] == "susie" and res.json["lang"] is None
-    # with defaults
-    res = ft_client.get("/who-am-i", auth="basic", status=200)
+    # with calvin default
+    res = api.get("/who-am-i", auth="basic", status=200)
     assert res.json["user"] == "calvin"
-    res = ft_client.get("/who-am-i", auth="param", status=200)
+    res = api.get("/who-am-i", auth="param", status=200)
     assert res.json["user"] == "calvin"
-    res = ft_client.get("/who-am-i", auth="bearer", status=200)
+    res = api.get("/who-am-i", auth="bearer", status=200)
     assert res.json["user"] == "calvin"
-    res = ft_client.get("/who-am-i", status=200)
+    res = api.get("/who-am-i", status=200)
     assert res.json["user"] == "calvin"
-    # ready for testing routes
-    yield ft_client
 
-def test_admin(api):
-    # check authentication schemes
-    for auth in (None, "basic", "param", "bearer"):
-        api.get("/admin", status=200, login="calvin", auth=auth)
-        api.get("/admin", 200, login="susie", auth=auth)
-        api.get("/admin", 403, login="hobbes", auth=auth)
-        api.get("/admin", 401, login="moe", auth=auth)
-        api.get("/admin", 401, login=None, auth=auth)
-        # test status error
-        try:
-            api.get("/admin", status=599, login="calvin", auth=auth)
-            pytest.fail("assert on status must fail")  # pragma: no cover
-        except ft._AssertError as e:
-            assert "200" in str(e)
-        # test content error
-        try:
-            api.get("/admin", status=200, login="calvin", auth=auth, content="NOT THERE")
-            pytest.fail("assert on content must fail")  # pragma: no cover
-        except ft._AssertError as e:
-            assert "NOT THERE" in str(e)
-
-def test_errors(api):
-    # these schemes are not allowed
-    for scheme in ("header", "cookie", "fake", "tparam"):
-        try:
-            api.get("/login", login="calvin", auth=scheme)
-            pytest.fail("must raise an exception")  # pragma: no cover
-        except ft.AuthError as e:
-            assert "auth is not allowed" in str(e)
-    try:
+AUTHS = [None, "basic", "param", "bearer"]
+
+# check authentication schemes
+@pytest.mark.parametrize("auth", AUTHS)
+@pytest.mark.parametrize("login,status", [("calvin", 200), ("susie", 200), ("hobbes", 403), ("moe", 401), (None, 401)])
+def test_admin(api, auth, login, status):
+    api.get("/admin", status, login=login, auth=auth)
+
+@pytest.mark.parametrize("auth", AUTHS)
+def test_admin_errors(api, auth):
+    # test status error
+    with pytest.raises(ft._AssertError) as e:
+        api.get("/admin", status=599, login="calvin", auth=auth)
+    assert "200" in str(e.value)
+    # test content error
+    with pytest.raises(ft._AssertError) as e:
+        api.get("/admin", status=200, login="calvin", auth=auth, content="NOT THERE")
+    assert "NOT THERE" in str(e.value)
+
+# these schemes are not allowed
+@pytest.mark.parametrize("scheme", ["header", "cookie", "fake", "tparam"])
+def test_errors(api, scheme):
+    with pytest.raises(ft.AuthError) as e:
+        api.get("/login", login="calvin", auth=scheme)
+    assert "auth is not allowed" in str(e.value)
+
+def test_unexpected_auth(api):
+    with pytest.raises(ft.AuthError) as e:
         api.get("/login", login="calvin", auth="foobla")
-        pytest.fail("must raise an exception")  # pragma: no cover
-    except ft.AuthError as e:
-        assert "unexpected auth" in str(e)
+    assert "unexpected auth" in str(e.value)
 
 def test_methods(api):
     res = api.get("/who-am-i", login="susie", status=200, cookies={"lang": "it"})
     assert res.json["lang"] == "it"
-    api.post("/who-am-i", login="hobbes", status=405)
-    api.put("/who-am-i", login="hobbes", status=405)
-    api.patch("/who-am-i", login="hobbes", status=405)
-    api.delete("/who-am-i", login="hobbes", status=405)
+
+@pytest.mark.parametrize("method", ["post", "put", "patch", "delete"])
+def test_bad_methods(api, method):
+    getattr(api, method)("/who-am-i", login="hobbes", status=405)
+
+def test_transport_cookies(ft_client):
+    # cookies kept by the transport, eg set by the app, are sent until restore
+    state = ft_client.snapshot()
+    ft_client.restore(state)
+    if isinstance(ft_client, ft.FlaskClient):
+        ft_client._client.set_cookie("lang", "it")
+    else:
+        ft_client._requests.cookies.set("lang", "it")
+    res = ft_client.get("/hello", login=None, status=200)
+    assert res.json["lang"] == "it"
+    ft_client.restore(state)
+    res = ft_client.get("/hello", login=None, status=200)
+    assert res.json["lang"] == "en"
 
 def test_hello(api):
     res = api.get("/hello", login="calvin", auth="none", status=200)
@@ -167,8 +200,12 @@ def test_hello(api):
     res = api.get("/hello", login="moe", auth="none", status=200)
     assert res.json["lang"] == "en" and res.json["hello"] == "Hi"
     assert res.headers["FSA-User"] == "None (None)"
+    # cookies as pairs, without authentication
+    res = api.get("/hello", login=None, status=200, cookies=[("lang", "it")])
+    assert res.json["lang"] == "it" and res.json["hello"] == "Ciao"
 
-def test_authenticator_token():
+@pytest.fixture(scope="session")
+def token_template():
     # all token carriers
     auth = ft.Authenticator(allow=["bearer", "header", "tparam", "cookie"])
     auth.setToken("calvin", "clv-token")
@@ -176,50 +213,54 @@ def test_authenticator_token():
     auth.setToken("hobbes", "hbs-token")
     auth.setToken("moe", "m-token")
     auth.setCookie("calvin", "what", "clv-cookie")
+    return auth
+
+@pytest.fixture
+def token_auth(token_template):
+    # fresh copy, tests may change credentials
+    return copy.deepcopy(token_template)
+
+@pytest.mark.parametrize("login,scheme,kwargs,expected,cookies", [
+    # no login, no authentication
+    (None, None, {}, {}, {}),
+    ("calvin", "bearer", {}, {"headers": {"Authorization": "Bearer clv-token"}}, {"what": "clv-cookie"}),
+    ("susie", "header", {}, {"headers": {"Auth": "ss-token"}}, {}),
+    ("hobbes", "tparam", {"data": {}}, {"data": {"AUTH": "hbs-token"}}, {}),
+    ("hobbes", "tparam", {"json": {}}, {"json": {"AUTH": "hbs-token"}}, {}),
+    ("moe", "cookie", {}, {}, {"auth": "m-token"}),
+])
+def test_authenticator_token(token_auth, login, scheme, kwargs, expected, cookies):
+    kwargs, got = copy.deepcopy(kwargs), {}  # parameters are shared
+    token_auth.setAuth(login, kwargs, got, auth=scheme)
+    assert kwargs == expected and got == cookies
+
+def test_authenticator_token_errors(token_auth):
+    auth = token_auth
     kwargs, cookies = {}, {}
-    auth.setAuth("calvin", kwargs, cookies, auth="bearer")
-    assert kwargs["headers"]["Authorization"] == "Bearer clv-token"
-    assert cookies["what"] == "clv-cookie"
-    kwargs, cookies = {}, {}
-    auth.setAuth("susie", kwargs, cookies, auth="header")
-    assert kwargs["headers"]["Auth"] == "ss-token"
-    assert not cookies
-    kwargs, cookies = {"data": {}}, {}
-    auth.setAuth("hobbes", kwargs, cookies, auth="tparam")
-    assert kwargs["data"]["AUTH"] == "hbs-token"
-    assert not cookies
-    kwargs, cookies = {"json": {}}, {}
-    auth.setAuth("hobbes", kwargs, cookies, auth="tparam")
-    assert kwargs["json"]["AUTH"] == "hbs-token"
-    assert not cookies
-    kwargs, cookies = {}, {}
-    auth.setAuth("moe", kwargs, cookies, auth="cookie")
-    assert not kwargs
-    assert cookies["auth"] == "m-token"
+    # token removal, twice
+    auth.setToken("moe", None)
+    assert "moe" not in auth._tokens
+    auth.setToken("moe", None)
     # dad does not have a token
-    try:
-        kwargs, cookies = {}, {}
+    with pytest.raises(ft.FlaskTesterError):
         auth.setAuth("dad", kwargs, cookies)
-        pytest.fail("must raise an error")  # pragma: no cover
-    except ft.FlaskTesterError:
-        assert True, "error raised"
+    # rejected before setting calvin cookies
+    kwargs.clear()
+    cookies.clear()
+    with pytest.raises(ft.AuthError):
+        auth.setAuth("calvin", kwargs, cookies, auth="basic")
+    assert not kwargs and not cookies
     # rosalyn as a password, but no password carrier is allowed
-    try:
+    with pytest.raises(ft.AuthError):
         auth.setPass("rosalyn", "rsln-pass")
-        pytest.fail("must raise an error")  # pragma: no cover
-    except ft.AuthError:
-        assert True, "error raised"
     # force to trigger later errors
     auth._has_pass = True
     auth.setPass("rosalyn", "rsln-pass")
-    try:
-        kwargs, cookies = {}, {}
+    with pytest.raises(ft.FlaskTesterError):
         auth.setAuth("rosalyn", kwargs, cookies)
-        pytest.fail("must raise an error")  # pragma: no cover
-    except ft.FlaskTesterError:
-        assert True, "error raised"
 
-def test_authenticator_password():
+@pytest.fixture(scope="session")
+def password_template():
     # all password carriers plus fake
     auth = ft.Authenticator(allow=["basic", "param", "fake"])
     auth.setPass("calvin", "clv-pass")
@@ -227,92 +268,163 @@ def test_authenticator_password():
     auth.setPass("moe", "m-pass")
     auth.setPass("rosalyn", "rsln-pass")
     auth.setCookie("moe", "hello", "world!")
-    kwargs, cookies = {}, {}
-    auth.setAuth("calvin", kwargs, cookies, auth="basic")
-    assert kwargs["auth"] == ("calvin", "clv-pass")
-    assert not cookies
-    kwargs, cookies = {"data": {}}, {}
-    auth.setAuth("hobbes", kwargs, cookies, auth="param")
-    assert kwargs["data"]["USER"] == "hobbes" and kwargs["data"]["PASS"] == "hbs-pass"
-    assert not cookies
-    kwargs, cookies = {"json": {}}, {}
-    auth.setAuth("moe", kwargs, cookies, auth="param")
-    assert kwargs["json"]["USER"] == "moe" and kwargs["json"]["PASS"] == "m-pass"
-    assert cookies["hello"] == "world!"
-    kwargs, cookies = {"data": {}}, {}
-    auth.setAuth("rosalyn", kwargs, cookies, auth="fake")
-    assert kwargs["data"]["LOGIN"] == "rosalyn"
-    assert not cookies
-    kwargs, cookies = {"json": {}}, {}
-    auth.setAuth("hobbes", kwargs, cookies, auth="fake")
-    assert kwargs["json"]["LOGIN"] == "hobbes"
-    assert not cookies
+    return auth
+
+@pytest.fixture
+def password_auth(password_template):
+    # fresh copy, tests may change credentials
+    return copy.deepcopy(password_template)
+
+@pytest.mark.parametrize("login,scheme,kwargs,expected,cookies", [
+    ("calvin", "basic", {}, {"auth": ("calvin", "clv-pass")}, {}),
+    ("hobbes", "param", {"data": {}}, {"data": {"USER": "hobbes", "PASS": "hbs-pass"}}, {}),
+    ("moe", "param", {"json": {}}, {"json": {"USER": "moe", "PASS": "m-pass"}}, {"hello": "world!"}),
+    ("rosalyn", "fake", {"data": {}}, {"data": {"LOGIN": "rosalyn"}}, {}),
+    ("hobbes", "fake", {"json": {}}, {"json": {"LOGIN": "hobbes"}}, {}),
+])
+def test_authenticator_password(password_auth, login, scheme, kwargs, expected, cookies):
+    kwargs, got = copy.deepcopy(kwargs), {}  # parameters are shared
+    password_auth.setAuth(login, kwargs, got, auth=scheme)
+    assert kwargs == expected and got == cookies
+
+def test_authenticator_password_errors(password_auth):
+    auth = password_auth
+    # login:password list
+    auth.setPasses(["susie:ss:pass"])
+    assert auth._passes["susie"] == "ss:pass"
+    with pytest.raises(ft.AuthError) as e:
+        auth.setPasses(["susie"])
+    assert "bad login:password" in str(e.value)
     # susie as a token, but no token carrier is allowed
-    try:
+    with pytest.raises(ft.FlaskTesterError):
         auth.setToken("susie", "ss-token")
-        pytest.fail("must raise an error")  # pragma: no cover
-    except ft.FlaskTesterError:
-        assert True, "error raised"
     # force to trigger later error
     auth._has_token = True
     auth.setToken("susie", "ss-token")
-    try:
-        kwargs, cookies = {}, {}
+    kwargs, cookies = {}, {}
+    with pytest.raises(ft.FlaskTesterError):
         auth.setAuth("susie", kwargs, cookies)
-        pytest.fail("must raise an error")  # pragma: no cover
-    except ft.FlaskTesterError:
-        assert True, "error raised"
 
-def test_request_flask_response():
+def test_authenticator_snapshot(password_auth):
+    state = password_auth.snapshot()
+    password_auth.setHook(lambda login, pw: None)
+    password_auth.setPass("susie", "ss-pass")
+    password_auth.setPass("moe", None)
+    password_auth.setCookie("moe", "hello", "you!")
+    kwargs, cookies = {}, {}
+    password_auth.setAuth("susie", kwargs, cookies)
+    assert kwargs == {"auth": ("susie", "ss-pass")}
+    # back to initial state, twice
+    for _ in range(2):
+        password_auth.restore(state)
+        assert password_auth._auth_hook is None
+        assert "susie" not in password_auth._passes and password_auth._passes["moe"] == "m-pass"
+        assert password_auth._cookies["moe"] == {"hello": "world!"}
+        # cached scheme is dropped
+        kwargs.clear()
+        password_auth.setAuth("susie", kwargs, cookies)
+        assert kwargs == {"data": {"LOGIN": "susie"}}
+        password_auth.setCookie("moe", "hello", "again")
 
-    class RequestResponse:
-        """Local class for testing RequestFlaskResponse."""
+def test_authenticator_str_login(password_auth):
+    # logins may be str subclasses
+    class Login(str):
+        pass
+    login = Login("susie")
+    password_auth.setPass(login, "ss-pass")
+    password_auth.setCookie(login, "lang", "it")
+    kwargs, cookies = {}, {}
+    password_auth.setAuth("susie", kwargs, cookies, auth="basic")
+    assert kwargs == {"auth": ("susie", "ss-pass")} and cookies == {"lang": "it"}
 
-        def __init__(self, is_json: bool):
-            self._is_json = is_json
-            self.status_code = 200
-            self.content = b"hello world!"
-            self.text = "hello world!"
-            self.headers = {"Server": "test/0.1"}
-            self.cookies = {}
+class RequestResponse:
+    """Local class for testing RequestFlaskResponse."""
 
-        def json(self):
-            if self._is_json:
-                return {"hello": "world!"}
-            else:
-                raise Exception("not json!")
+    def __init__(self, is_json: bool, mimetype: str = "application/json"):
+        self._is_json = is_json
+        self.status_code = 200
+        self.content = b"hello world!"
+        self.text = "hello world!"
+        self.headers = {"Server": "test/0.1", "Content-Type": mimetype}
+        self.cookies = {}
 
-    jres = ft.RequestFlaskResponse(RequestResponse(True))
-    assert jres.is_json and jres.json is not None
+    def json(self):
+        if self._is_json:
+            return {"hello": "world!"}
+        else:
+            raise Exception("not json!")
 
-    xres = ft.RequestFlaskResponse(RequestResponse(False))
-    assert not xres.is_json and xres.json is None
+# only declared json is decoded
+@pytest.mark.parametrize("is_json,mimetype,expected", [
+    (True, "application/json", True),
+    (False, "application/json", False),
+    (True, "text/plain; charset=utf-8", False),
+    (True, "application/problem+json", True),
+    (True, "Application/JSON", True),
+    (True, "application/Problem+JSON; charset=utf-8", True),
+])
+def test_request_flask_response(is_json, mimetype, expected):
+    res = ft.RequestFlaskResponse(RequestResponse(is_json, mimetype))
+    assert res.is_json == expected and (res.json is not None) == expected
+
+def test_request_flask_response_lazy():
+    # json is decoded lazily, whichever attribute comes first
+    res = ft.RequestFlaskResponse(RequestResponse(True))
+    assert res.json == {"hello": "world!"} and res.is_json
+    # other attributes are forwarded
+    assert res.data == b"hello world!" and res.text == "hello world!"
+    assert res.headers["Server"] == "test/0.1" and res.cookies == {}
 
 def test_client():
     # abstract class for coverage
     client = ft.Client(ft.Authenticator())
-    try:
+    with pytest.raises(NotImplementedError):
         client._request("GET", "/", {})
-        pytest.fail("must raise an error")  # pragma: no cover
-    except NotImplementedError:
-        assert True, "expected error raised"
-
-def test_request_client():
-    # start a tmp server on port 8888 for URL client coverage
-    httpd = htsv.HTTPServer(("", 8888), htsv.SimpleHTTPRequestHandler)
-    thread = threading.Thread(target = lambda: httpd.serve_forever())
+    client.restore(client.snapshot())
+
+@pytest.fixture(scope="session")
+def httpd_url():
+    # start a tmp server on a free port for URL client coverage
+    httpd = htsv.ThreadingHTTPServer(("localhost", 0), htsv.SimpleHTTPRequestHandler)
+    httpd.daemon_threads = True
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
     thread.start()
+    yield f"http://localhost:{httpd.server_address[1]}"
+    httpd.shutdown()
+    thread.join()
+
+# upload payload, each post consumes the stream
+HELLO = b"hello world"
+
+def test_request_client(httpd_url):
+    client = ft.RequestClient(ft.Authenticator(), httpd_url)
     try:
-        client = ft.RequestClient(ft.Authenticator(), "http://localhost:8888")
         client.get("/", 200)
         client.request("GET", "/", 200)
-        hello = io.BytesIO(b"hello world")
+        hello = io.BytesIO(HELLO)
         client.post("/", 501, data={"hello": hello})
-        hello = io.BytesIO(b"hello world")
+        hello.seek(0)
         client.post("/", 501, data={"hello": (hello, "hello.txt", "text/plain")})
+        hello.seek(0)
+        client.post("/", 501, data={"hello": hello, "who": "world"})
         client.post("/", 501, data={"hello": "world!"})
     finally:
-        httpd.shutdown()
+        client.close()
+    # bounded content search
+    client = ft.RequestClient(ft.Authenticator(), httpd_url, search_max=16)
+    try:
+        client.get("/", 200, "DOCTYPE")
+        client.get("/", 200, re.compile(r"doctype", re.IGNORECASE))
+        client.get("/", 200, b"DOCTYPE")
+        with pytest.raises(ft._AssertError) as e:
+            client.get("/", 200, "Directory listing")
+        assert "Directory listing" in str(e.value)
+        # session cookies are cleared on restore
+        client._requests.cookies.set("hello", "world")
+        client.restore(client.snapshot())
+        assert not client._requests.cookies
+    finally:
+        client.close()
 
 def test_client_fixture():
     # ft_client coverage
@@ -328,53 +440,71 @@ def test_client_fixture():
     os.environ["FLASK_TESTER_APP"] = "http://localhost:5000"
     init = ft._ft_client(auth)
     assert isinstance(init, ft.RequestClient)
+    init.close()
+    # search bound
+    os.environ["FLASK_TESTER_SEARCH_MAX"] = "1000"
+    init = ft._ft_client(auth)
+    assert init._search_max == 1000
+    init.close()
+    del os.environ["FLASK_TESTER_SEARCH_MAX"]
     del os.environ["FLASK_TESTER_APP"]
+    # application is created once per session, but per client otherwise
+    os.environ["FLASK_TESTER_APP"] = "app2:create_app"
+    scope = os.environ.pop("FLASK_TESTER_SCOPE", None)
+    assert ft._ft_client(auth)._client.application is ft._ft_client(auth)._client.application
+    os.environ["FLASK_TESTER_SCOPE"] = "function"
+    assert ft._ft_client(auth)._client.application is not ft._ft_client(auth)._client.application
+    del os.environ["FLASK_TESTER_SCOPE"]
+    if scope:
+        os.environ["FLASK_TESTER_SCOPE"] = scope
     # bad package
     os.environ["FLASK_TESTER_APP"] = "no_such_package"
-    try:
+    with pytest.raises(ModuleNotFoundError):
         init = ft._ft_client(auth)
-        pytest.fail("must fail on missing package")  # pragma: no cover
-    except ModuleNotFoundError:
-        assert True, "expected error raised"
     # bad name
     os.environ["FLASK_TESTER_APP"] = "app:no_such_app"
-    try:
+    with pytest.raises(ft.FlaskTesterError):
         init = ft._ft_client(auth)
-        pytest.fail("must fail on missing package")  # pragma: no cover
-    except ft.FlaskTesterError:
-        assert True, "expected error raised"
     del os.environ["FLASK_TESTER_APP"]
     # reset env
     if app:
         os.environ["FLASK_TESTER_APP"] = app
 
-def test_classes(api):
-
-    def thing_eq(ta, tb):
-        ta = model.Thing1(**ta) if isinstance(ta, dict) else ta
-        tb = model.Thing1(**tb) if isinstance(tb, dict) else tb
-        return ta.tid == tb.tid and ta.name == tb.name and ta.owner == tb.owner
-
-    # Things
-    t0 = {"tid": 0, "name": "zero", "owner": "Rosalyn"}
-    t1 = model.Thing1(tid=1, name="one", owner="Susie")
-    t2 = model.Thing2(tid=2, name="two", owner="Calvin")
-    t3 = model.Thing3(tid=3, name="three", owner="Hobbes")
-
-    n = 0
-    # check all combinations
-    for path in ["/t0", "/t1", "/t2", "/t3"]:
-        for param in [t0, t1, t2, t3]:
-            for tclass in [dict, model.Thing1, model.Thing2, model.Thing3]:
-                for method in ["GET", "POST"]:
-                    for mode in ["data", "json"]:
-                        n +=1
-                        parameter = {mode: {"t": param}}
-                        res = api.request(method, path, 200, **parameter)
-                        assert res.is_json and isinstance(res.json, dict)
-                        assert thing_eq(tclass(**res.json), param)
-    assert n == 256
+def test_fixture_scope():
+    scope = os.environ.pop("FLASK_TESTER_SCOPE", None)
+    assert ft._ft_scope("ft_client", None) == "session"
+    os.environ["FLASK_TESTER_SCOPE"] = "function"
+    assert ft._ft_scope("ft_client", None) == "function"
+    del os.environ["FLASK_TESTER_SCOPE"]
+    if scope:
+        os.environ["FLASK_TESTER_SCOPE"] = scope
+
+def thing_tuple(t):
+    if isinstance(t, dict):
+        return t["tid"], t["name"], t["owner"]
+    return t.tid, t.name, t.owner
+
+# Things
+THINGS = [
+    {"tid": 0, "name": "zero", "owner": "Rosalyn"},
+    model.Thing1(tid=1, name="one", owner="Susie"),
+    model.Thing2(tid=2, name="two", owner="Calvin"),
+    model.Thing3(tid=3, name="three", owner="Hobbes"),
+]
+
+# check all combinations, the response class does not change the request
+@pytest.mark.parametrize("path", ["/t0", "/t1", "/t2", "/t3"])
+@pytest.mark.parametrize("param", THINGS, ids=["t0", "t1", "t2", "t3"])
+@pytest.mark.parametrize("method", ["GET", "POST"])
+@pytest.mark.parametrize("mode", ["data", "json"])
+def test_classes(api, path, param, method, mode):
+    res = api.request(method, path, 200, **{mode: {"t": param}})
+    assert res.is_json and isinstance(res.json, dict)
+    expected = thing_tuple(param)
+    for tclass in [dict, model.Thing1, model.Thing2, model.Thing3]:
+        assert thing_tuple(tclass(**res.json)) == expected
 
+def test_simple_types(api):
     # simple types translation
     assert api.get("/t0", 200, json={"t": None}).json is None
     assert api.get("/t0", 200, data={"t": None}).json is None
@@ -390,3 +520,6 @@ def test_classes(api):
     assert api.get("/t0", 200, json={"t": "Susie"}).json == "Susie"
     api.get("/t0", 400, data={"t": "Susie"})  # raw str is not JSON
     assert api.get("/t0", 200, data={"t": "\"Susie\""}).json == "Susie"
+    # subclasses of simple types
+    assert api.get("/t0", 200, data={"t": collections.OrderedDict(a=1)}).json == {"a": 1}
+    assert api.get("/t0", 200, json={"t": collections.OrderedDict(b=2)}).json == {"b": 2}